@@ -0,0 +1,93 @@
+"""Benchmark JSON serialization and response compression for API payloads.
+
+Run from backend/: python benchmarks/bench_json_compression.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils.json_provider import FastJSONProvider
+from utils.compression import init_compression
+
+DESCRIPTIONS = (
+    'Молодой детектив расследует серию загадочных исчезновений в маленьком '
+    'северном городе, где у каждого жителя есть своя тайна.',
+    'Бывший боксёр возвращается на ринг, чтобы спасти семейный спортзал и '
+    'помириться с сыном, который давно перестал ему верить.',
+    'Команда учёных отправляется к краю Солнечной системы, где сигнал '
+    'неизвестного происхождения меняет всё, что они знали о времени.',
+    'Две подруги открывают кафе в старом районе Петербурга и неожиданно '
+    'оказываются в центре городской легенды о пропавшем кладе.',
+)
+
+
+def chat_payload(n_recommendations=10):
+    """Payload shaped like a /api/chat response"""
+    return {
+        'success': True,
+        'response': 'Вот несколько вариантов на вечер: ' + ' '.join(DESCRIPTIONS),
+        'recommendations': [
+            {
+                'title': f'Фильм {i}',
+                'description': DESCRIPTIONS[i % len(DESCRIPTIONS)] + f' Сезон {i + 1}.',
+                'genres': ['детектив', 'драма', 'триллер'],
+                'url': f'https://okko.tv/movie/film-{i}',
+                'score': 0.42,
+                'mood_match': 0.33,
+                'time_match': 0.67
+            }
+            for i in range(n_recommendations)
+        ],
+        'context': {
+            'time_of_day': 'evening', 'day_of_week': 'friday', 'hour': 21,
+            'is_weekend': False, 'timezone': 'Europe/Moscow'
+        },
+        'detected_mood': 'thoughtful'
+    }
+
+
+def make_app(provider_class, compress):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    if compress:
+        init_compression(app)
+
+    payload = chat_payload()
+
+    @app.route('/payload')
+    def payload_route():
+        return app.json.response(payload)
+
+    return app
+
+
+def bench(label, app, accept_encoding, number=2000):
+    client = app.test_client()
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+    size = len(client.get('/payload', headers=headers).get_data())
+    seconds = timeit.timeit(lambda: client.get('/payload', headers=headers), number=number)
+    print(f"{label:<32} {number / seconds:>10.0f} req/s {size:>10} bytes")
+
+
+def main():
+    print(f"{'configuration':<32} {'throughput':>14} {'on wire':>16}")
+    bench('stdlib json, identity', make_app(DefaultJSONProvider, False), None)
+    bench('fast json, identity', make_app(FastJSONProvider, False), None)
+    bench('fast json, gzip', make_app(FastJSONProvider, True), 'gzip')
+    bench('fast json, br (if available)', make_app(FastJSONProvider, True), 'br, gzip')
+
+    provider = FastJSONProvider(Flask(__name__))
+    stdlib = DefaultJSONProvider(Flask(__name__))
+    payload = chat_payload()
+    for label, dumps in (('stdlib dumps', stdlib.dumps), ('fast dumps', provider.dumps)):
+        seconds = timeit.timeit(lambda: dumps(payload), number=20000)
+        print(f"{label:<32} {seconds / 20000 * 1e6:>10.1f} us/op")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import click
+
+# Same as services.catalog_export.EXPORT_FORMATS; the export modules pull in
+# psycopg2, so they are imported only when the command runs
+EXPORT_FORMATS = ('ndjson', 'arrow', 'parquet')
+
+
+def register_commands(app):
+    """Register Flask CLI commands"""
+
+    @app.cli.command('export-catalog')
+    @click.option('--format', 'output_format', type=click.Choice(EXPORT_FORMATS), default='ndjson')
+    @click.option('--output', required=True, help='Output file path')
+    @click.option('--itersize', type=click.IntRange(min=1), default=None, help='Rows fetched per server-side cursor round trip')
+    @click.option('--batch-size', type=click.IntRange(min=1), default=None, help='Rows per Arrow/Parquet record batch')
+    def export_catalog_command(output_format, output, itersize, batch_size):
+        """Stream the enriched catalog to NDJSON, Arrow or Parquet"""
+        from models.database import DatabaseManager
+        from services.catalog_export import export_catalog
+
+        db = DatabaseManager(app.config)
+        with db.open_catalog(itersize=itersize or app.config['EXPORT_ITERSIZE']) as rows:
+            count = export_catalog(
+                rows, output, output_format,
+                batch_size=batch_size or app.config['EXPORT_BATCH_SIZE']
+            )
+        click.echo(f"Exported {count} titles to {output}")
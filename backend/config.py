@@ -1,11 +1,24 @@
 import os
 from datetime import timedelta
-from dotenv import load_dotenv
+
+
+# Settings that may be overridden from the environment / .env file
+ENV_SETTINGS = (
+    'SECRET_KEY', 'APP_URL', 'OPENROUTER_API_KEY',
+    'DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USER', 'DB_PASSWORD',
+    'ADMIN_TOKEN'
+)
+
+
+def load_environment():
+    """Load .env into the process environment and return env-backed settings"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return {key: os.environ[key] for key in ENV_SETTINGS if key in os.environ}
 
 
 class Config:
     """Base configuration"""
-    load_dotenv()
     SECRET_KEY = os.getenv('SECRET_KEY', 'okko-secret-key-change-in-production')
     APP_URL = os.getenv('APP_URL', 'http://localhost:3000')
     
@@ -28,18 +41,79 @@ class Config:
     # Embedding Model
     EMBEDDING_MODEL = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
     
+    # Load heavy components (embedding model, sentiment analyzer) in the
+    # background as soon as the app serves its first request (not for CLI
+    # commands); /api/ready reports progress. Failures are retried with
+    # exponential backoff between WARMUP_RETRY_DELAY and WARMUP_RETRY_MAX_DELAY
+    WARMUP_ON_START = True
+    WARMUP_RETRY_DELAY = 5
+    WARMUP_RETRY_MAX_DELAY = 300
+    
     # CORS Configuration
     CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:5000', 'http://127.0.0.1:5000']
     
+    # Bulkheads: per-dependency adaptive concurrency limits (AIMD on latency).
+    # Requests that cannot get a slot within queue_timeout are shed with 503.
+    # LLM completions take as long as the generated text, so the LLM limit
+    # adapts to slowdowns relative to recent latency instead of a fixed target.
+    LLM_CONCURRENCY = {
+        'initial_limit': 8, 'min_limit': 1, 'max_limit': 32,
+        'latency_target': None, 'latency_tolerance': 2.0,
+        'queue_timeout': 0.5, 'retry_after': 5
+    }
+    DB_CONCURRENCY = {
+        'initial_limit': 10, 'min_limit': 2, 'max_limit': 40,
+        'latency_target': 0.5, 'queue_timeout': 0.2, 'retry_after': 1
+    }
+    EXPORT_CONCURRENCY = {
+        'initial_limit': 2, 'min_limit': 2, 'max_limit': 2,
+        'queue_timeout': 0, 'retry_after': 30
+    }
+    LLM_CIRCUIT_BREAKER = {'failure_threshold': 5, 'reset_timeout': 30}
+    
+    # Response compression (non-streaming responses only)
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVEL = 6
+    COMPRESS_BR_QUALITY = 4
+    COMPRESS_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+    
+    # Batch recommendations
+    BATCH_MAX_SIZE = 5000
+    BATCH_MAX_LIMIT = 50
+    
+    # Catalog export (server-side cursor fetch size, rows per Arrow batch)
+    EXPORT_ITERSIZE = 2000
+    EXPORT_BATCH_SIZE = 10000
+    
+    # Admin endpoints (disabled when empty)
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+    # On-demand sampling profiler
+    PROFILER_INTERVAL = 0.005
+    PROFILER_MAX_SECONDS = 60
+    # Optional signal trigger (e.g. 'SIGPROF'); off by default because
+    # gunicorn reserves SIGUSR1/SIGUSR2/SIGHUP/SIGTTIN/SIGTTOU
+    PROFILER_SIGNAL = None
+    PROFILER_SIGNAL_SECONDS = 30
+    PROFILER_SIGNAL_ALLOCATIONS = False
+    PROFILER_OUTPUT_DIR = 'data/profiles'
+
     # Context Weights (for scoring algorithm)
     CONTEXT_WEIGHTS = {
         'mood': 0.3,
         'time_of_day': 0.15,
         'day_of_week': 0.1,
         'social_context': 0.15,
-        'duration': 0.15
+        'duration': 0.15,
+        'personal': 0.2
     }
     
+    # Session preference profiles (decayed genre affinity, mood history)
+    PROFILE_MAX_SESSIONS = 10000
+    PROFILE_TTL = 24 * 3600
+    PROFILE_DECAY = 0.8
+    PROFILE_MOOD_HISTORY = 10
+    
     # Mood-Genre Mapping
     MOOD_GENRE_MAP = {
         'happy': ['комедия', 'приключения', 'семейный'],
@@ -52,6 +126,9 @@ class Config:
         'energetic': ['боевик', 'приключения', 'спорт']
     }
     
+    # Timezone used when the request has no (or an unknown) city
+    DEFAULT_TIMEZONE = 'Europe/Moscow'
+    
     # Time of Day Preferences
     TIME_PREFERENCES = {
         'morning': ['мотивационный', 'комедия', 'семейный'],
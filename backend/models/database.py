@@ -1,11 +1,41 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from contextlib import contextmanager
+import sys
+from contextlib import contextmanager, ExitStack
 import logging
 from config import Config
+from models.title import Title
+from utils.single_flight import SingleFlight
+from utils.concurrency import bulkhead
 
 logger = logging.getLogger(__name__)
 
+# Column order of rows yielded by DatabaseManager.open_catalog
+CATALOG_COLUMNS = (
+    'title_id', 'serial_name', 'content_type', 'age_rating', 'release_date',
+    'description', 'url', 'genres', 'actors', 'countries', 'director'
+)
+
+class CatalogRows:
+    """Rows of an already executed catalog query; close() releases the connection"""
+    
+    def __init__(self, cursor, resources):
+        self._cursor = cursor
+        self._resources = resources
+    
+    def __iter__(self):
+        for row in self._cursor:
+            yield row
+    
+    def close(self):
+        self._resources.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._resources.__exit__(*exc_info)
+
 class DatabaseManager:
     """Manages PostgreSQL database connections and queries"""
     
@@ -18,28 +48,39 @@ class DatabaseManager:
             'user': self.config.get("DB_USER"),
             'password': self.config.get("DB_PASSWORD")
         }
+        self._flights = SingleFlight('db')
+        self.limiter = bulkhead('db', **(self.config.get('DB_CONCURRENCY') or {}))
+        self.export_limiter = bulkhead('db_export', **(self.config.get('EXPORT_CONCURRENCY') or {}))
     
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
-        try:
-            conn = psycopg2.connect(**self.connection_params)
-            yield conn
-            conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            if conn:
-                conn.close()
+    def get_connection(self, limiter=None):
+        """Context manager for database connections, bounded by the DB bulkhead"""
+        with (limiter or self.limiter).slot():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.connection_params)
+                yield conn
+                conn.commit()
+            except Exception as e:
+                if conn:
+                    conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+            finally:
+                if conn:
+                    conn.close()
     
     def search_by_genres(self, genres, limit=20):
-        """Search movies by genres"""
+        """Search movies by genres, returned as compact Title records.
+        
+        Concurrent identical searches share a single query.
+        """
+        key = ('search_by_genres', tuple(sorted(genres)), limit)
+        return self._flights.do(key, self._search_by_genres, genres, limit)
+    
+    def _search_by_genres(self, genres, limit):
         with self.get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            with conn.cursor() as cur:
                 query = """
                     SELECT DISTINCT t.title_id, t.serial_name, t.content_type, 
                            t.age_rating, t.release_date, t.description, t.url,
@@ -62,7 +103,7 @@ class DatabaseManager:
                     LIMIT %s
                 """
                 cur.execute(query, (genres, limit))
-                return cur.fetchall()
+                return [Title.from_row(row) for row in cur]
     
     def search_by_title(self, title_query):
         """Search movies by title (fuzzy match)"""
@@ -158,4 +199,42 @@ class DatabaseManager:
                     LIMIT 20
                 """
                 cur.execute(query, params)
-                return cur.fetchall()
\ No newline at end of file
+                return cur.fetchall()
+    
+    def open_catalog(self, itersize=2000):
+        """Run the full enriched catalog query and return CatalogRows (see CATALOG_COLUMNS).
+        
+        The export slot, connection and query are taken eagerly, so errors
+        and load shedding surface here rather than halfway through a stream.
+        Uses a named server-side cursor, so only `itersize` rows are held
+        in memory at a time regardless of catalog size. Close the result
+        (or use it as a context manager) to release the connection.
+        """
+        query = """
+            SELECT t.title_id, t.serial_name, t.content_type,
+                   t.age_rating, t.release_date, t.description, t.url,
+                   ARRAY(SELECT g.name FROM title_genre tg
+                         JOIN genre g ON tg.genre_id = g.genre_id
+                         WHERE tg.title_id = t.title_id ORDER BY g.name) as genres,
+                   ARRAY(SELECT a.name FROM title_actor ta
+                         JOIN actor a ON ta.actor_id = a.actor_id
+                         WHERE ta.title_id = t.title_id ORDER BY a.name) as actors,
+                   ARRAY(SELECT c.country FROM title_country c
+                         WHERE c.title_id = t.title_id ORDER BY c.country) as countries,
+                   (SELECT string_agg(d.name, ', ' ORDER BY d.name)
+                    FROM title_director_item tdi
+                    JOIN director_item d ON tdi.director_item_id = d.director_item_id
+                    WHERE tdi.title_id = t.title_id) as director
+            FROM title t
+            ORDER BY t.title_id
+        """
+        resources = ExitStack()
+        try:
+            conn = resources.enter_context(self.get_connection(self.export_limiter))
+            cur = resources.enter_context(conn.cursor(name='catalog_export'))
+            cur.itersize = itersize
+            cur.execute(query)
+        except BaseException:
+            resources.__exit__(*sys.exc_info())
+            raise
+        return CatalogRows(cur, resources)
@@ -1,7 +1,7 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
 import pickle
 import os
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,10 +10,28 @@ class EmbeddingManager:
     """Manages text embeddings for semantic search"""
     
     def __init__(self, model_name='sentence-transformers/paraphrase-multilingual-mpnet-base-v2'):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
         self.embeddings_cache = {}
         self.cache_file = 'data/embeddings/cache.pkl'
     
+    @property
+    def is_loaded(self):
+        """Whether the SentenceTransformer model has been loaded"""
+        return self._model is not None
+    
+    @property
+    def model(self):
+        """SentenceTransformer model, imported and loaded on first use"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    logger.info(f"Loading embedding model {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+    
     def encode_text(self, text):
         """Encode text to vector embedding"""
         if isinstance(text, list):
@@ -0,0 +1,141 @@
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+_WORD_MASK = (1 << 64) - 1
+_WORD_BITS = np.arange(64, dtype=np.uint64)
+
+
+class GenreIndex:
+    """Interns genre names to bit positions so a genre set is a single int"""
+
+    def __init__(self):
+        self._bits = {}
+        self._names = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def bit(self, name):
+        """Bit position of a genre, assigned on first sight"""
+        bit = self._bits.get(name)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(name)
+                if bit is None:
+                    bit = len(self._names)
+                    self._names.append(name)
+                    self._bits[name] = bit
+        return bit
+
+    def mask(self, names):
+        """Bitmask for an iterable of genre names (None entries are skipped)"""
+        mask = 0
+        for name in names or ():
+            if name is not None:
+                mask |= 1 << self.bit(name)
+        return mask
+
+    def name(self, bit):
+        """Genre name at a bit position"""
+        return self._names[bit]
+
+    def names(self, mask):
+        """Genre names of a bitmask, sorted alphabetically"""
+        names = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                names.append(self._names[bit])
+            mask >>= 1
+            bit += 1
+        return sorted(names)
+
+    def matrix(self, masks, width=None):
+        """Dense (len(masks), width) 0/1 float32 membership matrix"""
+        width = width or max(len(self._names), 1)
+        out = np.zeros((len(masks), width), dtype=np.float32)
+        for shift in range(0, width, 64):
+            words = np.fromiter(
+                ((m >> shift) & _WORD_MASK for m in masks),
+                dtype=np.uint64, count=len(masks)
+            )
+            cols = min(64, width - shift)
+            out[:, shift:shift + cols] = (words[:, None] >> _WORD_BITS[:cols]) & np.uint64(1)
+        return out
+
+
+# Process-wide genre interning table
+GENRES = GenreIndex()
+
+
+@dataclass(slots=True)
+class Title:
+    """Compact catalog record used in the recommendation path"""
+    title_id: int
+    serial_name: str
+    content_type: str
+    age_rating: object
+    release_date: date
+    description: str
+    url: str
+    genre_mask: int
+    countries: tuple
+    actors: tuple
+    director: str
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from a tuple row in TITLE_COLUMNS order"""
+        (title_id, serial_name, content_type, age_rating, release_date,
+         description, url, genres, countries, actors, director) = row
+        if isinstance(release_date, str):
+            release_date = date.fromisoformat(release_date[:10])
+        return cls(
+            title_id, serial_name, content_type, age_rating, release_date,
+            description, url, GENRES.mask(genres),
+            tuple(c for c in countries or () if c is not None),
+            tuple(a for a in actors or () if a is not None),
+            director
+        )
+
+    @property
+    def genres(self):
+        return GENRES.names(self.genre_mask)
+
+
+# Column order expected by Title.from_row
+TITLE_COLUMNS = (
+    'title_id', 'serial_name', 'content_type', 'age_rating', 'release_date',
+    'description', 'url', 'genres', 'countries', 'actors', 'director'
+)
+
+
+class ScoredTitles:
+    """Ranked titles with their scores kept as parallel numpy arrays"""
+    __slots__ = ('titles', 'scores', 'mood_match', 'time_match')
+
+    def __init__(self, titles, scores, mood_match, time_match):
+        self.titles = titles
+        self.scores = scores
+        self.mood_match = mood_match
+        self.time_match = time_match
+
+    @classmethod
+    def empty(cls):
+        empty = np.zeros(0, dtype=np.float64)
+        return cls([], empty, empty, empty)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError('ScoredTitles only supports slicing')
+        return ScoredTitles(
+            self.titles[index], self.scores[index],
+            self.mood_match[index], self.time_match[index]
+        )
@@ -0,0 +1,103 @@
+from flask import Blueprint, current_app, request, jsonify, Response
+import logging
+
+from utils.auth import admin_required
+from utils.profiler import ProfilerBusyError
+from utils.concurrency import OverloadedError
+from routes.api import overloaded_response
+
+logger = logging.getLogger(__name__)
+
+admin = Blueprint('admin', __name__)
+
+@admin.route('/api/admin/profile', methods=['POST'])
+@admin_required
+def start_profile():
+    """Start sampling this worker for N seconds in the background"""
+    try:
+        data = request.get_json(silent=True) or {}
+        seconds = float(data.get('seconds', 10))
+        track_allocations = bool(data.get('allocations', False))
+        
+        current_app.extensions['profiler'].start(
+            seconds,
+            track_allocations=track_allocations,
+            output_dir=current_app.config.get('PROFILER_OUTPUT_DIR')
+        )
+        return jsonify({'success': True, 'status': 'running', 'seconds': seconds}), 202
+    
+    except ProfilerBusyError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except Exception as e:
+        logger.error(f"Profiler error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@admin.route('/api/admin/profile', methods=['GET'])
+@admin_required
+def get_profile():
+    """Return the latest finished profile of this worker"""
+    profiler = current_app.extensions['profiler']
+    output_format = request.args.get('format', 'speedscope')
+    
+    if output_format not in ('speedscope', 'collapsed'):
+        return jsonify({'success': False, 'error': 'format must be speedscope or collapsed'}), 400
+    if profiler.running:
+        return jsonify({'success': True, 'status': 'running'}), 202
+    if profiler.last_error:
+        return jsonify({'success': False, 'error': profiler.last_error}), 500
+    
+    result = profiler.last_result
+    if result is None:
+        return jsonify({'success': False, 'error': 'No profile recorded yet'}), 404
+    
+    response = {
+        'success': True,
+        'status': 'done',
+        'samples': result.sample_count,
+        'duration': round(result.duration, 3),
+        'format': output_format,
+        'profile': result.to_speedscope() if output_format == 'speedscope' else result.to_collapsed()
+    }
+    if result.allocations is not None:
+        response['allocations'] = result.allocations
+    return jsonify(response)
+
+@admin.route('/api/admin/catalog/export', methods=['GET'])
+@admin_required
+def export_catalog():
+    """Stream the full enriched catalog as NDJSON or an Arrow IPC stream"""
+    from models.database import DatabaseManager
+    from services.catalog_export import iter_ndjson, iter_arrow_stream, require_pyarrow
+    
+    try:
+        output_format = request.args.get('format', 'ndjson')
+        itersize = request.args.get('itersize', current_app.config['EXPORT_ITERSIZE'], type=int)
+        batch_size = request.args.get('batch_size', current_app.config['EXPORT_BATCH_SIZE'], type=int)
+        
+        if output_format not in ('ndjson', 'arrow'):
+            return jsonify({'success': False, 'error': 'format must be ndjson or arrow'}), 400
+        if itersize <= 0 or batch_size <= 0:
+            return jsonify({'success': False, 'error': 'itersize and batch_size must be positive'}), 400
+        if output_format == 'arrow':
+            try:
+                require_pyarrow()
+            except RuntimeError as e:
+                return jsonify({'success': False, 'error': str(e)}), 501
+        
+        # Open eagerly (export slot included) so shedding and database errors
+        # are reported before the 200 is sent
+        rows = DatabaseManager(current_app.config).open_catalog(itersize=itersize)
+        
+        if output_format == 'arrow':
+            response = Response(iter_arrow_stream(rows, batch_size=batch_size),
+                                mimetype='application/vnd.apache.arrow.stream')
+        else:
+            response = Response(iter_ndjson(rows), mimetype='application/x-ndjson')
+        response.call_on_close(rows.close)
+        return response
+    
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        logger.error(f"Catalog export error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,330 @@
+from flask import Blueprint, current_app, request, jsonify, Response
+import logging
+from datetime import datetime
+
+from utils.prompts import PromptTemplates
+from utils.concurrency import OverloadedError, dependency_stats
+
+logger = logging.getLogger(__name__)
+
+api = Blueprint('api', __name__)
+
+def services():
+    """Service container of the current app"""
+    return current_app.extensions['services']
+
+def overloaded_response(error):
+    """503 response with Retry-After for shed requests"""
+    response = jsonify({'success': False, 'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def fold_profile(session_id, message, mood):
+    """Session profile with the message folded in; save() it once the request succeeds"""
+    return services().profile_store.fold(session_id, message, mood)
+
+def parse_limit(value, default, maximum):
+    """Positive integer limit capped at maximum (default when absent, None when invalid)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return min(value, maximum) if value > 0 else None
+
+def serialize_recommendations(scored, include_matches=False):
+    """Convert ScoredTitles into the JSON recommendation list"""
+    scores = scored.scores.round(2).tolist()
+    if include_matches:
+        mood_match = scored.mood_match.round(2).tolist()
+        time_match = scored.time_match.round(2).tolist()
+    
+    recommendations = []
+    for i, movie in enumerate(scored.titles):
+        rec = {
+            'title': movie.serial_name,
+            'description': movie.description,
+            'genres': movie.genres,
+            'url': movie.url,
+            'score': scores[i]
+        }
+        if include_matches:
+            rec['mood_match'] = mood_match[i]
+            rec['time_match'] = time_match[i]
+        recommendations.append(rec)
+    return recommendations
+
+# Store conversation history
+conversation_history = {}
+
+@api.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+
+@api.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: reports whether heavy components are warm"""
+    status = services().readiness()
+    status['dependencies'] = dependency_stats()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@api.route('/api/context', methods=['POST'])
+def get_context():
+    """Get current context (time, weather, etc.)"""
+    try:
+        data = request.json
+        city = data.get('city', 'Moscow')
+        
+        time_context = services().context_service.get_time_context(city)
+        return jsonify({
+            'success': True,
+            'context': time_context.to_dict()
+        })
+    except Exception as e:
+        logger.error(f"Context error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/chat', methods=['POST'])
+def chat():
+    """Main chat endpoint"""
+    try:
+        data = request.json
+        user_message = data.get('message', '')
+        session_id = data.get('session_id', 'default')
+        city = data.get('city', 'Moscow')
+        
+        if not user_message:
+            return jsonify({'success': False, 'error': 'Message is required'}), 400
+        
+        # Initialize or get conversation history
+        if session_id not in conversation_history:
+            conversation_history[session_id] = []
+        
+        # Get context
+        full_context = services().context_service.get_time_context(city)
+        
+        # Detect mood; the profile is stored only once the request succeeds,
+        # so a retry after a 503 does not count the message twice
+        mood_info = services().mood_detector.detect_mood(user_message)
+        profile = fold_profile(session_id, user_message, mood_info['mood'])
+        
+        # Generate recommendations first: the DB bulkhead may shed the request
+        recommendations = services().recommendation_engine.generate_recommendations(
+            user_message, 
+            full_context, 
+            limit=5,
+            profile=profile
+        )
+        
+        # Build messages for LLM
+        messages = [
+            {'role': 'system', 'content': PromptTemplates.SYSTEM_PROMPT}
+        ]
+        
+        # Add conversation history
+        messages.extend(conversation_history[session_id][-10:])  # Last 10 messages
+        
+        # Add current user message with context
+        context_prompt = PromptTemplates.create_recommendation_prompt(
+            user_message, full_context, mood_info
+        )
+        messages.append({'role': 'user', 'content': context_prompt})
+        
+        # Get LLM response; degrade to recommendations only when the LLM is unhealthy
+        degraded = False
+        try:
+            assistant_response = services().llm_service.create_chat_completion(
+                messages, 
+                stream=False, 
+                temperature=0.7
+            )
+        except Exception as e:
+            logger.warning(f"Chat degraded to recommendations only: {e}")
+            assistant_response = PromptTemplates.DEGRADED_RESPONSE
+            degraded = True
+        
+        # Update conversation history and the session profile
+        if not degraded:
+            conversation_history[session_id].append({'role': 'user', 'content': user_message})
+            conversation_history[session_id].append({'role': 'assistant', 'content': assistant_response})
+        services().profile_store.save(session_id, profile)
+        
+        return jsonify({
+            'success': True,
+            'response': assistant_response,
+            'recommendations': serialize_recommendations(recommendations, include_matches=True),
+            'context': full_context.to_dict(),
+            'detected_mood': mood_info['mood'],
+            'degraded': degraded
+        })
+    
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        logger.error(f"Chat error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Streaming chat endpoint"""
+    try:
+        data = request.json
+        user_message = data.get('message', '')
+        session_id = data.get('session_id', 'default')
+        
+        if not user_message:
+            return jsonify({'success': False, 'error': 'Message is required'}), 400
+        
+        # Initialize conversation history
+        if session_id not in conversation_history:
+            conversation_history[session_id] = []
+        
+        # Build messages
+        messages = [
+            {'role': 'system', 'content': PromptTemplates.SYSTEM_PROMPT}
+        ]
+        messages.extend(conversation_history[session_id][-10:])
+        messages.append({'role': 'user', 'content': user_message})
+        
+        # Stream response (resolve the service now, the generator runs outside the app context)
+        llm_service = services().llm_service
+        dumps = current_app.json.dumps
+        
+        # Fail fast instead of opening a stream while the LLM circuit is open
+        llm_service.breaker.allow_request()
+        
+        def generate():
+            full_response = ""
+            try:
+                for chunk in llm_service.create_chat_completion(messages, stream=True):
+                    full_response += chunk
+                    yield f"data: {dumps({'content': chunk})}\n\n"
+            except Exception as e:
+                logger.error(f"Stream error: {e}")
+                yield f"data: {dumps({'error': str(e), 'done': True})}\n\n"
+                return
+            
+            # Update history
+            conversation_history[session_id].append({'role': 'user', 'content': user_message})
+            conversation_history[session_id].append({'role': 'assistant', 'content': full_response})
+            
+            yield f"data: {dumps({'done': True})}\n\n"
+        
+        return Response(generate(), mimetype='text/event-stream')
+    
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        logger.error(f"Stream error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/recommendations', methods=['POST'])
+def get_recommendations():
+    """Get recommendations without chat"""
+    try:
+        data = request.json
+        query = data.get('query', '')
+        city = data.get('city', 'Moscow')
+        session_id = data.get('session_id')
+        
+        # Get context
+        full_context = services().context_service.get_time_context(city)
+        
+        # Personalize when the caller identifies a session
+        profile = None
+        if session_id:
+            mood = services().mood_detector.detect_mood(query)['mood']
+            profile = fold_profile(session_id, query, mood)
+        
+        # Generate recommendations
+        recommendations = services().recommendation_engine.generate_recommendations(
+            query, 
+            full_context,
+            limit=10,
+            profile=profile
+        )
+        if profile is not None:
+            services().profile_store.save(session_id, profile)
+        
+        return jsonify({
+            'success': True,
+            'recommendations': serialize_recommendations(recommendations)
+        })
+    
+    except OverloadedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        logger.error(f"Recommendations error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/recommendations/batch', methods=['POST'])
+def get_recommendations_batch():
+    """Get recommendations for many users/queries, streamed back as NDJSON"""
+    try:
+        data = request.json
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Body must be a JSON object'}), 400
+        
+        items = data.get('requests', [])
+        max_limit = current_app.config['BATCH_MAX_LIMIT']
+        limit = parse_limit(data.get('limit'), 10, max_limit)
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'requests must be a non-empty list'}), 400
+        if len(items) > current_app.config['BATCH_MAX_SIZE']:
+            return jsonify({'success': False, 'error': 'Batch is too large'}), 413
+        if limit is None:
+            return jsonify({'success': False, 'error': 'limit must be a positive integer'}), 400
+        
+        # Validate every item before streaming starts: errors after the
+        # first line can no longer change the status code
+        item_limits = []
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                return jsonify({'success': False, 'error': f'requests[{position}] must be an object'}), 400
+            if not isinstance(item.get('query', ''), str):
+                return jsonify({'success': False, 'error': f'requests[{position}].query must be a string'}), 400
+            item_limit = parse_limit(item.get('limit'), limit, max_limit)
+            if item_limit is None:
+                return jsonify({'success': False, 'error': f'requests[{position}].limit must be a positive integer'}), 400
+            item_limits.append(item_limit)
+        
+        context_service = services().context_service
+        profile_store = services().profile_store
+        batch = [
+            {
+                'query': item.get('query', ''),
+                'context': context_service.get_time_context(item.get('city')),
+                'profile': profile_store.get(item['session_id']) if item.get('session_id') else None,
+                'limit': item_limit
+            }
+            for item, item_limit in zip(items, item_limits)
+        ]
+        ids = [item.get('id') for item in items]
+        
+        # Resolve the engine now, the generator runs outside the app context
+        recommendation_engine = services().recommendation_engine
+        dumps = current_app.json.dumps
+        
+        def generate():
+            try:
+                for index, recommendations in recommendation_engine.generate_recommendations_batch(batch, limit=limit):
+                    yield dumps({
+                        'index': index,
+                        'id': ids[index],
+                        'recommendations': serialize_recommendations(recommendations)
+                    }) + '\n'
+            except Exception as e:
+                logger.error(f"Batch recommendations error: {e}")
+                yield dumps({'error': str(e)}) + '\n'
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    
+    except Exception as e:
+        logger.error(f"Batch recommendations error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,134 @@
+import io
+import json
+import logging
+from datetime import date
+from itertools import islice
+
+from models.database import CATALOG_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('ndjson', 'arrow', 'parquet')
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def require_pyarrow():
+    """Import pyarrow or raise RuntimeError with an install hint"""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError('Arrow/Parquet export requires pyarrow (pip install pyarrow)')
+
+
+def _batches(rows, batch_size):
+    """Split a row iterator into lists of at most batch_size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def catalog_schema(pa, columns=CATALOG_COLUMNS):
+    """Fixed Arrow schema for catalog columns.
+
+    Declared rather than inferred, so a column that is all NULL in the first
+    batch cannot fix a wrong type for the rest of the export.
+    """
+    strings = pa.list_(pa.string())
+    types = {
+        'title_id': pa.int64(),
+        'serial_name': pa.string(),
+        'content_type': pa.string(),
+        'age_rating': pa.int64(),
+        'release_date': pa.date32(),
+        'description': pa.string(),
+        'url': pa.string(),
+        'genres': strings,
+        'actors': strings,
+        'countries': strings,
+        'director': pa.string()
+    }
+    return pa.schema([pa.field(name, types[name]) for name in columns])
+
+
+def iter_ndjson(rows, columns=CATALOG_COLUMNS):
+    """Yield one NDJSON line per catalog row"""
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) + '\n'
+
+
+def iter_record_batches(rows, columns=CATALOG_COLUMNS, batch_size=10000):
+    """Transpose tuple rows into Arrow record batches of batch_size rows"""
+    pa = require_pyarrow()
+    schema = catalog_schema(pa, columns)
+
+    for batch in _batches(rows, batch_size):
+        arrays = list(zip(*batch))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(arrays, schema)],
+            schema=schema
+        )
+
+
+def iter_arrow_stream(rows, columns=CATALOG_COLUMNS, batch_size=10000):
+    """Yield Arrow IPC stream bytes, one chunk per record batch"""
+    pa = require_pyarrow()
+    sink = io.BytesIO()
+    writer = None
+
+    for record_batch in iter_record_batches(rows, columns, batch_size):
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, record_batch.schema)
+        writer.write_batch(record_batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+
+    if writer is not None:
+        writer.close()
+        yield sink.getvalue()
+
+
+def export_catalog(rows, output, output_format='ndjson', batch_size=10000):
+    """Write catalog rows to a file path in the given format; returns row count"""
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {output_format}")
+
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    if output_format == 'ndjson':
+        with open(output, 'w', encoding='utf-8') as f:
+            f.writelines(iter_ndjson(counted(rows)))
+    elif output_format == 'arrow':
+        with open(output, 'wb') as f:
+            for chunk in iter_arrow_stream(counted(rows), batch_size=batch_size):
+                f.write(chunk)
+    else:
+        require_pyarrow()
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for record_batch in iter_record_batches(counted(rows), batch_size=batch_size):
+                if writer is None:
+                    writer = pq.ParquetWriter(output, record_batch.schema)
+                writer.write_batch(record_batch)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    logger.info(f"Exported {count} catalog rows to {output} ({output_format})")
+    return count
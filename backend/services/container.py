@@ -0,0 +1,117 @@
+import time
+import threading
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Lazily constructs and caches the application services"""
+
+    def __init__(self, config):
+        self.config = config
+        self._services = {}
+        self._lock = threading.RLock()
+        self._sentiment_warm = False
+        self._warmup_error = None
+        self._warmup_started_at = None
+        self._warmup_finished_at = None
+        self._warmup_thread = None
+        self._warmup_done = False
+        self._warmup_retry_at = 0.0
+        self._warmup_delay = self._setting('WARMUP_RETRY_DELAY', 5)
+
+    def _setting(self, key, default):
+        if isinstance(self.config, dict):
+            return self.config.get(key, default)
+        return getattr(self.config, key, default)
+
+    def _get(self, name, factory):
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    logger.info(f"Initializing {name}")
+                    service = factory()
+                    self._services[name] = service
+        return service
+
+    @property
+    def llm_service(self):
+        from services.llm_service import LLMService
+        return self._get('llm_service', lambda: LLMService(self.config))
+
+    @property
+    def recommendation_engine(self):
+        from services.recommendation_engine import RecommendationEngine
+        return self._get('recommendation_engine', lambda: RecommendationEngine(self.config))
+
+    @property
+    def context_service(self):
+        from services.context_service import ContextService
+        return self._get('context_service', lambda: ContextService(self.config))
+
+    @property
+    def profile_store(self):
+        from services.profile_service import ProfileStore
+        return self._get('profile_store', lambda: ProfileStore(self.config))
+    
+    @property
+    def mood_detector(self):
+        from utils.mood_detector import MoodDetector
+        return self._get('mood_detector', MoodDetector)
+
+    def warm_up(self):
+        """Construct all services and load the heavy models"""
+        self._warmup_started_at = datetime.now()
+        try:
+            self.context_service
+            self.llm_service
+            self.mood_detector.warm_up()
+            self._sentiment_warm = True
+            self.recommendation_engine.embeddings.model
+            self._warmup_error = None
+            self._warmup_done = True
+        except Exception as e:
+            # Retry later with exponential backoff (see ensure_warm_up)
+            self._warmup_error = str(e)
+            self._warmup_retry_at = time.monotonic() + self._warmup_delay
+            logger.error(f"Warm-up error (retrying in {self._warmup_delay}s): {e}")
+            self._warmup_delay = min(self._warmup_delay * 2, self._setting('WARMUP_RETRY_MAX_DELAY', 300))
+        finally:
+            self._warmup_finished_at = datetime.now()
+            logger.info(f"Warm-up finished: {self.readiness()['components']}")
+
+    def ensure_warm_up(self):
+        """Start warm_up in a background thread unless it is running, done or backing off"""
+        if self._warmup_done:
+            return
+        with self._lock:
+            if self._warmup_thread is not None and self._warmup_thread.is_alive():
+                return
+            if self._warmup_error and time.monotonic() < self._warmup_retry_at:
+                return
+            self._warmup_thread = threading.Thread(target=self.warm_up, name='warm-up', daemon=True)
+            self._warmup_thread.start()
+
+    def readiness(self):
+        """Report which heavy components are loaded"""
+        components = {name: name in self._services for name in (
+            'llm_service', 'recommendation_engine', 'context_service', 'mood_detector'
+        )}
+        engine = self._services.get('recommendation_engine')
+        components['embedding_model'] = engine is not None and engine.embeddings.is_loaded
+        components['sentiment'] = self._sentiment_warm
+        status = {
+            'ready': all(components.values()),
+            'components': components
+        }
+        if self._warmup_started_at:
+            status['warmup_started_at'] = self._warmup_started_at.isoformat()
+        if self._warmup_finished_at:
+            status['warmup_finished_at'] = self._warmup_finished_at.isoformat()
+        if self._warmup_error:
+            status['error'] = self._warmup_error
+        return status
@@ -1,11 +1,52 @@
 import requests
+import time
+from dataclasses import dataclass
 from datetime import datetime
 import pytz
 import logging
 from config import Config
+from utils.city_timezones import CITY_TIMEZONES, normalize_city
 
 logger = logging.getLogger(__name__)
 
+# Precomputed time-of-day bucket for every hour of the day
+_HOUR_BUCKETS = tuple(
+    'morning' if 5 <= hour < 12 else
+    'afternoon' if 12 <= hour < 17 else
+    'evening' if 17 <= hour < 22 else
+    'night'
+    for hour in range(24)
+)
+
+# Bound on raw city strings remembered from requests
+_MAX_CACHED_CITIES = 4096
+
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+
+@dataclass(frozen=True, slots=True)
+class TimeContext:
+    """Immutable, hashable time context usable as a cache key"""
+    time_of_day: str
+    day_of_week: str
+    hour: int
+    is_weekend: bool
+    timezone: str
+
+    def get(self, key, default=None):
+        """Dict-style access for code that treats context as a mapping"""
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {
+            'time_of_day': self.time_of_day,
+            'day_of_week': self.day_of_week,
+            'hour': self.hour,
+            'is_weekend': self.is_weekend,
+            'timezone': self.timezone
+        }
+
+
 class ContextService:
     """Detects and manages contextual information"""
     
@@ -13,31 +54,60 @@ class ContextService:
         self.config = config or Config()
         if isinstance(self.config, dict):
             self.time_preferences = self.config.get('TIME_PREFERENCES', {})
+            self.default_timezone = self.config.get('DEFAULT_TIMEZONE', 'Europe/Moscow')
         else:
             self.time_preferences = self.config.TIME_PREFERENCES
+            self.default_timezone = self.config.DEFAULT_TIMEZONE
+        
+        self._city_zones = {}
+        self._timezones = {}
+        # timezone -> (valid_from, valid_until, TimeContext)
+        self._contexts = {}
     
-    def get_time_context(self, timezone='Europe/Moscow'):
-        """Get time-based context"""
-        tz = pytz.timezone(timezone)
-        now = datetime.now(tz)
-        hour = now.hour
-        day_of_week = now.strftime('%A')
-        
-        if 5 <= hour < 12:
-            time_of_day = 'morning'
-        elif 12 <= hour < 17:
-            time_of_day = 'afternoon'
-        elif 17 <= hour < 22:
-            time_of_day = 'evening'
-        else:
-            time_of_day = 'night'
+    def resolve_timezone(self, city=None):
+        """Resolve a city name (or IANA zone name) to a timezone name"""
+        # Anything but a non-empty string (e.g. a number or list from JSON) is unknown
+        if not city or not isinstance(city, str):
+            return self.default_timezone
         
-        return {
-            'time_of_day': time_of_day,
-            'day_of_week': day_of_week.lower(),
-            'hour': hour,
-            'is_weekend': day_of_week in ['Saturday', 'Sunday']
-        }
+        zone = self._city_zones.get(city)
+        if zone is None:
+            zone = CITY_TIMEZONES.get(normalize_city(city))
+            if zone is None:
+                zone = city if city in pytz.all_timezones_set else self.default_timezone
+            if len(self._city_zones) < _MAX_CACHED_CITIES:
+                self._city_zones[city] = zone
+        return zone
+    
+    def _get_tz(self, zone):
+        tz = self._timezones.get(zone)
+        if tz is None:
+            tz = self._timezones[zone] = pytz.timezone(zone)
+        return tz
+    
+    def get_time_context(self, city=None):
+        """Get time-based context for a city (defaults to DEFAULT_TIMEZONE)"""
+        zone = self.resolve_timezone(city)
+        now = time.time()
+        
+        cached = self._contexts.get(zone)
+        if cached is not None and cached[0] <= now < cached[1]:
+            return cached[2]
+        
+        local = datetime.fromtimestamp(now, self._get_tz(zone))
+        weekday = local.weekday()
+        context = TimeContext(
+            time_of_day=_HOUR_BUCKETS[local.hour],
+            day_of_week=_WEEKDAYS[weekday],
+            hour=local.hour,
+            is_weekend=weekday >= 5,
+            timezone=zone
+        )
+        
+        # The context stays valid until the end of the current local hour
+        hour_start = now - (local.minute * 60 + local.second + local.microsecond / 1e6)
+        self._contexts[zone] = (hour_start, hour_start + 3600, context)
+        return context
     
     def determine_content_preferences(self, context):
         """Determine content preferences based on context"""
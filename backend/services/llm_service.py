@@ -1,7 +1,10 @@
 import requests
 import json
+import time
 import logging
 from config import Config
+from utils.single_flight import SingleFlight, StreamFanout
+from utils.concurrency import bulkhead, circuit_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +18,23 @@ class LLMService:
             self.base_url = self.config.get('OPENROUTER_BASE_URL')
             self.model = self.config.get('OPENROUTER_MODEL')
             self.app_url = self.config.get('APP_URL')
+            concurrency = self.config.get('LLM_CONCURRENCY') or {}
+            breaker_settings = self.config.get('LLM_CIRCUIT_BREAKER') or {}
         else:
             self.api_key = self.config.OPENROUTER_API_KEY
             self.base_url = self.config.OPENROUTER_BASE_URL
             self.model = self.config.OPENROUTER_MODEL
             self.app_url = self.config.APP_URL
+            concurrency = self.config.LLM_CONCURRENCY
+            breaker_settings = self.config.LLM_CIRCUIT_BREAKER
+        
+        # Bulkhead and circuit breaker shared by all LLM calls in this process
+        self.limiter = bulkhead('llm', **concurrency)
+        self.breaker = circuit_breaker('llm', **breaker_settings)
+        
+        # Identical concurrent prompts share one upstream call / token stream
+        self._flights = SingleFlight('llm')
+        self._streams = StreamFanout('llm-stream')
         
     def create_chat_completion(self, messages, stream=False, temperature=0.7, max_tokens=1000):
         """Create chat completion with OpenRouter API"""
@@ -38,46 +53,77 @@ class LLMService:
             'stream': stream
         }
         
+        key = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        
         try:
             if stream:
-                return self._stream_completion(headers, payload)
+                return self._streams.subscribe(key, lambda: self._stream_completion(headers, payload))
             else:
+                return self._flights.do(key, self._completion, headers, payload)
+        except Exception as e:
+            logger.error(f"LLM API error: {e}")
+            raise
+    
+    @property
+    def healthy(self):
+        """False while the circuit breaker is open"""
+        return self.breaker.healthy
+    
+    def _completion(self, headers, payload):
+        """Non-streaming completion request"""
+        with self.breaker.guard(), self.limiter.slot(kind='completion'):
+            response = requests.post(
+                f'{self.base_url}/chat/completions',
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content']
+    
+    def _stream_completion(self, headers, payload):
+        """Stream completion responses.
+        
+        The bulkhead slot is held until the stream ends; the limit adapts to
+        the time until response headers arrive, not to the stream length.
+        """
+        with self.breaker.guard():
+            self.limiter.acquire()
+            started = time.monotonic()
+            latency = None
+            failed = False
+            response = None
+            try:
                 response = requests.post(
                     f'{self.base_url}/chat/completions',
                     headers=headers,
                     json=payload,
+                    stream=True,
                     timeout=30
                 )
                 response.raise_for_status()
-                return response.json()['choices'][0]['message']['content']
-        except Exception as e:
-            logger.error(f"LLM API error: {e}")
-            raise
-    
-    def _stream_completion(self, headers, payload):
-        """Stream completion responses"""
-        response = requests.post(
-            f'{self.base_url}/chat/completions',
-            headers=headers,
-            json=payload,
-            stream=True,
-            timeout=30
-        )
-        response.raise_for_status()
-        
-        for line in response.iter_lines():
-            if line:
-                line_text = line.decode('utf-8')
-                if line_text.startswith('data: '):
-                    data_str = line_text[6:]
-                    if data_str.strip() == '[DONE]':
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        if 'choices' in data and len(data['choices']) > 0:
-                            delta = data['choices'][0].get('delta', {})
-                            content = delta.get('content', '')
-                            if content:
-                                yield content
-                    except json.JSONDecodeError:
-                        continue
\ No newline at end of file
+                latency = time.monotonic() - started
+                
+                for line in response.iter_lines():
+                    if line:
+                        line_text = line.decode('utf-8')
+                        if line_text.startswith('data: '):
+                            data_str = line_text[6:]
+                            if data_str.strip() == '[DONE]':
+                                break
+                            try:
+                                data = json.loads(data_str)
+                                if 'choices' in data and len(data['choices']) > 0:
+                                    delta = data['choices'][0].get('delta', {})
+                                    content = delta.get('content', '')
+                                    if content:
+                                        yield content
+                            except json.JSONDecodeError:
+                                continue
+            except Exception:
+                failed = True
+                raise
+            finally:
+                if response is not None:
+                    response.close()
+                self.limiter.release(latency, failed, kind='first_byte')
@@ -0,0 +1,155 @@
+import re
+import time
+import threading
+import logging
+from collections import Counter, OrderedDict, deque
+
+import numpy as np
+
+from config import Config
+from models.title import GENRES
+
+logger = logging.getLogger(__name__)
+
+# Russian noun/adjective inflection endings, longest first; a message word
+# mentions a genre if it is the genre's root plus one of these
+_ENDINGS = (
+    'ами', 'ями', 'ого', 'его', 'ому', 'ему',
+    'ом', 'ем', 'ой', 'ей', 'ов', 'ев', 'ам', 'ям', 'ах', 'ях',
+    'ый', 'ий', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ым', 'им', 'ых', 'их', 'ую', 'юю',
+    'а', 'я', 'ы', 'и', 'у', 'ю', 'е', 'о', 'й', ''
+)
+_WORD_RE = re.compile(r'\w+')
+
+
+def _root(word):
+    """Word without its inflection ending (kept whole if that leaves < 3 letters)"""
+    for ending in _ENDINGS:
+        if ending and word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[:-len(ending)]
+    return word
+
+
+class UserProfile:
+    """Compact per-session preference state, updated in O(1) per message"""
+    __slots__ = ('genre_affinity', 'moods', 'updated_at')
+
+    def __init__(self, mood_history=10):
+        self.genre_affinity = np.zeros(0, dtype=np.float32)
+        self.moods = deque(maxlen=mood_history)
+        self.updated_at = time.monotonic()
+
+    def affinity_vector(self, width):
+        """Genre affinity padded to the current GENRES width"""
+        if len(self.genre_affinity) >= width:
+            return self.genre_affinity[:width]
+        return np.pad(self.genre_affinity, (0, width - len(self.genre_affinity)))
+
+    @property
+    def dominant_mood(self):
+        """Most frequent recent mood, ignoring 'neutral'"""
+        counts = Counter(mood for mood in self.moods if mood != 'neutral')
+        return counts.most_common(1)[0][0] if counts else None
+
+    def top_genres(self, k=2, min_affinity=0.5):
+        """Names of the k genres with the highest affinity"""
+        if not len(self.genre_affinity):
+            return []
+        top = np.argsort(-self.genre_affinity)[:k]
+        return [GENRES.name(int(bit)) for bit in top if self.genre_affinity[bit] >= min_affinity]
+
+
+class ProfileStore:
+    """Per-session profiles with LRU eviction and idle TTL"""
+
+    def __init__(self, config=None):
+        self.config = config or Config()
+        if isinstance(self.config, dict):
+            self.max_profiles = self.config.get('PROFILE_MAX_SESSIONS', 10000)
+            self.ttl = self.config.get('PROFILE_TTL', 24 * 3600)
+            self.decay = self.config.get('PROFILE_DECAY', 0.8)
+            self.mood_history = self.config.get('PROFILE_MOOD_HISTORY', 10)
+            self.mood_genre_map = self.config.get('MOOD_GENRE_MAP', {})
+            time_preferences = self.config.get('TIME_PREFERENCES', {})
+        else:
+            self.max_profiles = self.config.PROFILE_MAX_SESSIONS
+            self.ttl = self.config.PROFILE_TTL
+            self.decay = self.config.PROFILE_DECAY
+            self.mood_history = self.config.PROFILE_MOOD_HISTORY
+            self.mood_genre_map = self.config.MOOD_GENRE_MAP
+            time_preferences = self.config.TIME_PREFERENCES
+
+        # Intern configured genres up front so they can be recognised in
+        # messages before the first catalog query
+        for genres in (*self.mood_genre_map.values(), *time_preferences.values()):
+            GENRES.mask(genres)
+
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def get(self, session_id):
+        """Profile for a session, or None if unknown or expired"""
+        with self._lock:
+            profile = self._profiles.get(session_id)
+            if profile is None:
+                return None
+            if time.monotonic() - profile.updated_at > self.ttl:
+                del self._profiles[session_id]
+                return None
+            self._profiles.move_to_end(session_id)
+            return profile
+
+    def fold(self, session_id, message, mood):
+        """Session profile with one message folded in, without storing it.
+        
+        Callers save() the result once the request has succeeded, so a
+        retried request does not count the same message twice.
+        """
+        genre_mask = GENRES.mask(self.mood_genre_map.get(mood, ()))
+        genre_mask |= self._mentioned_genres(message)
+
+        # An expired profile starts over, as in get()
+        current = self.get(session_id) or UserProfile(self.mood_history)
+
+        profile = UserProfile(self.mood_history)
+        profile.moods.extend(current.moods)
+        profile.moods.append(mood)
+
+        # Decayed genre counts: older messages fade by `decay` per turn
+        width = len(GENRES)
+        affinity = current.affinity_vector(width) * self.decay
+        if genre_mask:
+            affinity += GENRES.matrix([genre_mask], width)[0]
+        profile.genre_affinity = affinity
+
+        return profile
+
+    def save(self, session_id, profile):
+        """Store a profile produced by fold()"""
+        profile.updated_at = time.monotonic()
+        with self._lock:
+            self._profiles[session_id] = profile
+            self._profiles.move_to_end(session_id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile
+
+    @staticmethod
+    def _mentioned_genres(message):
+        """Bitmask of known genres mentioned in the message (any inflected form)"""
+        words = set(_WORD_RE.findall(message.lower()))
+        mask = 0
+        for bit in range(len(GENRES)):
+            name = GENRES.name(bit)
+            if not name:
+                continue
+            # Every word of the genre name must appear as a whole message word
+            if all(
+                any(word.startswith(root) and word[len(root):] in _ENDINGS for word in words)
+                for root in map(_root, _WORD_RE.findall(name.lower()))
+            ):
+                mask |= 1 << bit
+        return mask
@@ -1,7 +1,11 @@
 import logging
+import numpy as np
+from datetime import date
 from models.database import DatabaseManager
+from models.title import GENRES, ScoredTitles
+from utils.single_flight import SingleFlight
 from models.embeddings import EmbeddingManager
-from services.context_service import ContextService
+from services.context_service import ContextService, TimeContext
 from utils.mood_detector import MoodDetector
 from config import Config
 
@@ -16,6 +20,7 @@ class RecommendationEngine:
         self.embeddings = EmbeddingManager()
         self.context_service = ContextService(config)
         self.mood_detector = MoodDetector()
+        self._flights = SingleFlight('recommendations')
         
         if isinstance(self.config, dict):
             self.mood_genre_map = self.config.get('MOOD_GENRE_MAP', {})
@@ -26,31 +31,113 @@ class RecommendationEngine:
             self.context_weights = self.config.CONTEXT_WEIGHTS
             self.time_preferences = self.config.TIME_PREFERENCES
     
-    def generate_recommendations(self, user_query, context=None, limit=10):
-        """Generate contextual recommendations"""
+    def generate_recommendations(self, user_query, context=None, limit=10, profile=None):
+        """Generate contextual recommendations.
+        
+        Concurrent calls with the same query, context and limit share one
+        computation (and the returned ScoredTitles, which must not be mutated).
+        Personalized calls (with a session profile) are not coalesced.
+        """
+        # Plain dict contexts are unhashable and bypass coalescing
+        if profile is not None or (context is not None and not isinstance(context, TimeContext)):
+            return self._generate_recommendations(user_query, context, limit, profile)
+        return self._flights.do(
+            (user_query, context, limit),
+            self._generate_recommendations, user_query, context, limit
+        )
+    
+    def _generate_recommendations(self, user_query, context, limit, profile=None):
         # Detect mood from query
-        mood_info = self.mood_detector.detect_mood(user_query)
-        detected_mood = mood_info['mood']
+        detected_mood = self._resolve_mood(user_query, profile)
         
         # Get current context if not provided
         if not context:
-            time_context = self.context_service.get_time_context()
-            context = {**time_context}
+            context = self.context_service.get_time_context()
         
         # Determine genre preferences
-        genre_preferences = self._determine_genres(detected_mood, context)
+        genre_preferences = self._determine_genres(detected_mood, context, profile)
         
         # Search database
         movies = self.db.search_by_genres(genre_preferences, limit=limit*2)
         
         # Score and rank
-        scored_movies = self._score_movies(movies, detected_mood, context)
+        scored_movies = self._score_movies(movies, detected_mood, context, profile)
         
         # Return top recommendations
         return scored_movies[:limit]
     
-    def _determine_genres(self, mood, context):
-        """Determine preferred genres based on mood and context"""
+    def generate_recommendations_batch(self, requests, limit=10):
+        """Generate recommendations for many queries at once.
+        
+        `requests` is a list of dicts with `query` and optional `context`,
+        `limit` and `profile`. Requests sharing (mood, time context) are
+        grouped: the candidate pool (mood, time and the members' profile
+        genres) is fetched once per group and scored in a single vectorized
+        pass, with the profile term of all personalized members computed as
+        one matrix product. Yields
+        `(index, recommendations)` per request, group by group.
+        """
+        default_context = None
+        groups = {}
+        
+        for index, item in enumerate(requests):
+            profile = item.get('profile')
+            mood = self._resolve_mood(item.get('query', ''), profile)
+            context = item.get('context')
+            if not context:
+                if default_context is None:
+                    default_context = self.context_service.get_time_context()
+                context = default_context
+            
+            key = (mood, context.get('time_of_day'), bool(context.get('is_weekend')))
+            if key not in groups:
+                groups[key] = (mood, context, [])
+            groups[key][2].append((index, item.get('limit') or limit, profile))
+        
+        logger.info(f"Batch of {len(requests)} requests grouped into {len(groups)} groups")
+        
+        for mood, context, members in groups.values():
+            pool_size = max(member_limit for _, member_limit, _ in members) * 2
+            genre_preferences = set(self._determine_genres(mood, context))
+            # The shared pool also covers the top genres of every member's profile
+            for _, _, profile in members:
+                if profile is not None:
+                    genre_preferences.update(profile.top_genres())
+            movies = self.db.search_by_genres(list(genre_preferences), limit=pool_size)
+            
+            if not movies:
+                for index, _, _ in members:
+                    yield index, ScoredTitles.empty()
+                continue
+            
+            genre_matrix, scores, mood_scores, time_scores = self._base_scores(movies, mood, context)
+            shared = None
+            
+            personalized = [member for member in members if member[2] is not None]
+            if personalized:
+                width = genre_matrix.shape[1]
+                affinities = np.stack([profile.affinity_vector(width) for _, _, profile in personalized])
+                personal = self._personal_scores(genre_matrix, affinities) * self.context_weights.get('personal', 0.0)
+                personal_rows = {index: row for (index, _, _), row in zip(personalized, personal)}
+            
+            for index, member_limit, profile in members:
+                if profile is None:
+                    if shared is None:
+                        shared = self._rank(movies, scores, mood_scores, time_scores)
+                    yield index, shared[:member_limit]
+                else:
+                    member_scores = scores + personal_rows[index]
+                    yield index, self._rank(movies, member_scores, mood_scores, time_scores)[:member_limit]
+    
+    def _resolve_mood(self, user_query, profile=None):
+        """Mood of the query, falling back to the session's recent mood"""
+        mood = self.mood_detector.detect_mood(user_query)['mood']
+        if mood not in self.mood_genre_map and profile is not None:
+            mood = profile.dominant_mood or mood
+        return mood
+    
+    def _determine_genres(self, mood, context, profile=None):
+        """Determine preferred genres based on mood, context and session profile"""
         genres = set()
         
         # Mood-based genres
@@ -61,81 +148,97 @@ class RecommendationEngine:
         content_prefs = self.context_service.determine_content_preferences(context)
         genres.update(content_prefs['genres'])
         
-        return list(genres)
-    
-    def _score_movies(self, movies, mood, context):
-        """Score movies based on multiple factors"""
-        scored = []
+        # Genres the session keeps coming back to
+        if profile is not None:
+            genres.update(profile.top_genres())
         
-        for movie in movies:
-            score = 0.0
-            
-            # Mood match score
-            mood_score = self._calculate_mood_score(movie, mood)
-            score += mood_score * self.context_weights['mood']
-            
-            # Time of day score
-            time_score = self._calculate_time_score(movie, context.get('time_of_day'))
-            score += time_score * self.context_weights['time_of_day']
-            
-            # Recency score
-            recency_score = self._calculate_recency_score(movie)
-            score += recency_score * 0.1
-            
-            scored.append({
-                'movie': movie,
-                'score': score,
-                'mood_match': mood_score,
-                'time_match': time_score,
-            })
-        
-        scored.sort(key=lambda x: x['score'], reverse=True)
-        return scored
+        return list(genres)
     
-    def _calculate_mood_score(self, movie, mood):
-        """Calculate mood compatibility score"""
-        if mood not in self.mood_genre_map:
-            return 0.5
+    def _score_movies(self, movies, mood, context, profile=None):
+        """Score movies based on multiple factors, in one vectorized pass"""
+        if not movies:
+            return ScoredTitles.empty()
         
-        preferred_genres = set(self.mood_genre_map[mood])
-        movie_genres = set(movie.get('genres', []))
+        genre_matrix, scores, mood_scores, time_scores = self._base_scores(movies, mood, context)
         
-        if not movie_genres:
-            return 0.3
+        if profile is not None:
+            affinity = profile.affinity_vector(genre_matrix.shape[1])[None, :]
+            scores = scores + self._personal_scores(genre_matrix, affinity)[0] * self.context_weights.get('personal', 0.0)
         
-        intersection = preferred_genres & movie_genres
-        return len(intersection) / len(preferred_genres) if preferred_genres else 0.5
+        return self._rank(movies, scores, mood_scores, time_scores)
+    
+    def _base_scores(self, movies, mood, context):
+        """Genre matrix and unsorted non-personal score components"""
+        masks = [movie.genre_mask for movie in movies]
+        genre_matrix = GENRES.matrix(masks)
+        
+        mood_scores = self._calculate_mood_scores(genre_matrix, masks, mood)
+        time_scores = self._calculate_time_scores(genre_matrix, context.get('time_of_day'))
+        recency_scores = self._calculate_recency_scores(movies)
+        
+        scores = (
+            mood_scores * self.context_weights['mood']
+            + time_scores * self.context_weights['time_of_day']
+            + recency_scores * 0.1
+        )
+        return genre_matrix, scores, mood_scores, time_scores
+    
+    @staticmethod
+    def _personal_scores(genre_matrix, affinities):
+        """(profiles, movies) share of each profile's genre affinity a movie covers"""
+        totals = affinities.sum(axis=1, keepdims=True)
+        weights = np.divide(affinities, totals, out=np.zeros_like(affinities), where=totals > 0)
+        return (weights @ genre_matrix.T).astype(np.float64)
+    
+    @staticmethod
+    def _rank(movies, scores, mood_scores, time_scores):
+        """Sort score arrays descending into ScoredTitles"""
+        # Stable descending sort, same tie order as list.sort(reverse=True)
+        order = np.argsort(-scores, kind='stable')
+        return ScoredTitles(
+            [movies[i] for i in order],
+            scores[order],
+            mood_scores[order],
+            time_scores[order]
+        )
+    
+    def _genre_overlap(self, genre_matrix, preferred_genres):
+        """Share of preferred genres present in each movie"""
+        preferred_genres = set(preferred_genres)
+        preferred = GENRES.matrix([GENRES.mask(preferred_genres)], genre_matrix.shape[1])[0]
+        return (genre_matrix @ preferred).astype(np.float64) / len(preferred_genres)
+    
+    def _calculate_mood_scores(self, genre_matrix, masks, mood):
+        """Calculate mood compatibility scores"""
+        if mood not in self.mood_genre_map or not self.mood_genre_map[mood]:
+            return np.full(len(masks), 0.5)
+        
+        scores = self._genre_overlap(genre_matrix, self.mood_genre_map[mood])
+        # Movies without genres get a neutral-low score
+        scores[np.fromiter((m == 0 for m in masks), dtype=bool, count=len(masks))] = 0.3
+        return scores
     
-    def _calculate_time_score(self, movie, time_of_day):
-        """Calculate time of day compatibility"""
+    def _calculate_time_scores(self, genre_matrix, time_of_day):
+        """Calculate time of day compatibility scores"""
         if not time_of_day or time_of_day not in self.time_preferences:
-            return 0.5
+            return np.full(genre_matrix.shape[0], 0.5)
+        if not self.time_preferences[time_of_day]:
+            return np.full(genre_matrix.shape[0], 0.3)
         
-        preferred_genres = set(self.time_preferences[time_of_day])
-        movie_genres = set(movie.get('genres', []))
-        
-        intersection = preferred_genres & movie_genres
-        return len(intersection) / len(preferred_genres) if preferred_genres else 0.3
+        return self._genre_overlap(genre_matrix, self.time_preferences[time_of_day])
     
-    def _calculate_recency_score(self, movie):
+    def _calculate_recency_scores(self, movies):
         """Score based on release date (prefer recent but not only new)"""
-        from datetime import datetime
-        
-        release_date = movie.get('release_date')
-        if not release_date:
-            return 0.5
-        
-        if isinstance(release_date, str):
-            release_date = datetime.fromisoformat(release_date.split('T')[0])
-        
-        years_old = (datetime.now() - release_date).days / 365.25
-        
-        # Sigmoid-like scoring: peak around 2-5 years old
-        if years_old < 1:
-            return 0.9
-        elif years_old < 5:
-            return 1.0
-        elif years_old < 10:
-            return 0.7
-        else:
-            return 0.5
\ No newline at end of file
+        today = date.today().toordinal()
+        release_days = np.fromiter(
+            (movie.release_date.toordinal() if movie.release_date else np.nan for movie in movies),
+            dtype=np.float64, count=len(movies)
+        )
+        years_old = (today - release_days) / 365.25
+        
+        # Sigmoid-like scoring: peak around 2-5 years old (NaN compares False -> 0.5)
+        return np.select(
+            [years_old < 1, years_old < 5, years_old < 10],
+            [0.9, 1.0, 0.7],
+            default=0.5
+        )
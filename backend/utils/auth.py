@@ -0,0 +1,19 @@
+import hmac
+from functools import wraps
+from flask import request, jsonify, current_app
+
+
+def admin_required(view):
+    """Protect an endpoint with the X-Admin-Token header"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = current_app.config.get('ADMIN_TOKEN')
+        if not expected:
+            return jsonify({'success': False, 'error': 'Admin endpoints are disabled'}), 403
+
+        provided = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return jsonify({'success': False, 'error': 'Forbidden'}), 403
+
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,87 @@
+# Offline city -> IANA timezone table (keys are lower-cased, "ё" -> "е")
+CITY_TIMEZONES = {
+    # Kaliningrad (UTC+2)
+    'калининград': 'Europe/Kaliningrad', 'kaliningrad': 'Europe/Kaliningrad',
+
+    # Moscow time (UTC+3)
+    'москва': 'Europe/Moscow', 'moscow': 'Europe/Moscow',
+    'санкт-петербург': 'Europe/Moscow', 'петербург': 'Europe/Moscow', 'спб': 'Europe/Moscow',
+    'saint petersburg': 'Europe/Moscow', 'st. petersburg': 'Europe/Moscow', 'st petersburg': 'Europe/Moscow',
+    'казань': 'Europe/Moscow', 'kazan': 'Europe/Moscow',
+    'нижний новгород': 'Europe/Moscow', 'nizhny novgorod': 'Europe/Moscow',
+    'ростов-на-дону': 'Europe/Moscow', 'rostov-on-don': 'Europe/Moscow',
+    'краснодар': 'Europe/Moscow', 'krasnodar': 'Europe/Moscow',
+    'воронеж': 'Europe/Moscow', 'voronezh': 'Europe/Moscow',
+    'сочи': 'Europe/Moscow', 'sochi': 'Europe/Moscow',
+    'ярославль': 'Europe/Moscow', 'yaroslavl': 'Europe/Moscow',
+    'тула': 'Europe/Moscow', 'tula': 'Europe/Moscow',
+    'мурманск': 'Europe/Moscow', 'murmansk': 'Europe/Moscow',
+    'архангельск': 'Europe/Moscow', 'arkhangelsk': 'Europe/Moscow',
+    'минск': 'Europe/Minsk', 'minsk': 'Europe/Minsk',
+    'симферополь': 'Europe/Simferopol', 'simferopol': 'Europe/Simferopol',
+    'волгоград': 'Europe/Volgograd', 'volgograd': 'Europe/Volgograd',
+
+    # Samara time (UTC+4)
+    'самара': 'Europe/Samara', 'samara': 'Europe/Samara',
+    'ижевск': 'Europe/Samara', 'izhevsk': 'Europe/Samara',
+    'саратов': 'Europe/Saratov', 'saratov': 'Europe/Saratov',
+    'ульяновск': 'Europe/Ulyanovsk', 'ulyanovsk': 'Europe/Ulyanovsk',
+    'астрахань': 'Europe/Astrakhan', 'astrakhan': 'Europe/Astrakhan',
+
+    # Yekaterinburg time (UTC+5)
+    'екатеринбург': 'Asia/Yekaterinburg', 'yekaterinburg': 'Asia/Yekaterinburg',
+    'челябинск': 'Asia/Yekaterinburg', 'chelyabinsk': 'Asia/Yekaterinburg',
+    'пермь': 'Asia/Yekaterinburg', 'perm': 'Asia/Yekaterinburg',
+    'уфа': 'Asia/Yekaterinburg', 'ufa': 'Asia/Yekaterinburg',
+    'тюмень': 'Asia/Yekaterinburg', 'tyumen': 'Asia/Yekaterinburg',
+    'оренбург': 'Asia/Yekaterinburg', 'orenburg': 'Asia/Yekaterinburg',
+    'сургут': 'Asia/Yekaterinburg', 'surgut': 'Asia/Yekaterinburg',
+
+    # Omsk time (UTC+6)
+    'омск': 'Asia/Omsk', 'omsk': 'Asia/Omsk',
+
+    # Krasnoyarsk / Novosibirsk time (UTC+7)
+    'новосибирск': 'Asia/Novosibirsk', 'novosibirsk': 'Asia/Novosibirsk',
+    'барнаул': 'Asia/Barnaul', 'barnaul': 'Asia/Barnaul',
+    'томск': 'Asia/Tomsk', 'tomsk': 'Asia/Tomsk',
+    'кемерово': 'Asia/Novokuznetsk', 'kemerovo': 'Asia/Novokuznetsk',
+    'новокузнецк': 'Asia/Novokuznetsk', 'novokuznetsk': 'Asia/Novokuznetsk',
+    'красноярск': 'Asia/Krasnoyarsk', 'krasnoyarsk': 'Asia/Krasnoyarsk',
+
+    # Irkutsk time (UTC+8)
+    'иркутск': 'Asia/Irkutsk', 'irkutsk': 'Asia/Irkutsk',
+    'улан-удэ': 'Asia/Irkutsk', 'ulan-ude': 'Asia/Irkutsk',
+
+    # Yakutsk time (UTC+9)
+    'якутск': 'Asia/Yakutsk', 'yakutsk': 'Asia/Yakutsk',
+    'чита': 'Asia/Chita', 'chita': 'Asia/Chita',
+    'благовещенск': 'Asia/Yakutsk', 'blagoveshchensk': 'Asia/Yakutsk',
+
+    # Vladivostok time (UTC+10)
+    'владивосток': 'Asia/Vladivostok', 'vladivostok': 'Asia/Vladivostok',
+    'хабаровск': 'Asia/Vladivostok', 'khabarovsk': 'Asia/Vladivostok',
+
+    # Magadan / Sakhalin time (UTC+11)
+    'магадан': 'Asia/Magadan', 'magadan': 'Asia/Magadan',
+    'южно-сахалинск': 'Asia/Sakhalin', 'yuzhno-sakhalinsk': 'Asia/Sakhalin',
+
+    # Kamchatka time (UTC+12)
+    'петропавловск-камчатский': 'Asia/Kamchatka', 'petropavlovsk-kamchatsky': 'Asia/Kamchatka',
+    'анадырь': 'Asia/Anadyr', 'anadyr': 'Asia/Anadyr',
+
+    # CIS capitals
+    'киев': 'Europe/Kyiv', 'kyiv': 'Europe/Kyiv', 'kiev': 'Europe/Kyiv',
+    'астана': 'Asia/Almaty', 'astana': 'Asia/Almaty',
+    'алматы': 'Asia/Almaty', 'almaty': 'Asia/Almaty',
+    'ташкент': 'Asia/Tashkent', 'tashkent': 'Asia/Tashkent',
+    'бишкек': 'Asia/Bishkek', 'bishkek': 'Asia/Bishkek',
+    'ереван': 'Asia/Yerevan', 'yerevan': 'Asia/Yerevan',
+    'тбилиси': 'Asia/Tbilisi', 'tbilisi': 'Asia/Tbilisi',
+    'баку': 'Asia/Baku', 'baku': 'Asia/Baku',
+    'кишинев': 'Europe/Chisinau', 'chisinau': 'Europe/Chisinau',
+}
+
+
+def normalize_city(city):
+    """Normalize a city name for CITY_TIMEZONES lookup"""
+    return ' '.join(city.strip().lower().replace('ё', 'е').split())
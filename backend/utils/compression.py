@@ -0,0 +1,45 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BR_QUALITY', 4))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', 6))
+
+
+def init_compression(app):
+    """Compress non-streaming responses above COMPRESS_MIN_SIZE (br or gzip)"""
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    mimetypes = set(app.config.get('COMPRESS_MIMETYPES', ('application/json',)))
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in mimetypes
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.set_data(_compress(data, encoding, app.config))
+        response.headers['Content-Encoding'] = encoding
+        return response
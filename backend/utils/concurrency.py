@@ -0,0 +1,237 @@
+import math
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a dependency has no capacity left; maps to HTTP 503"""
+
+    def __init__(self, name, retry_after=1, message=None):
+        super().__init__(message or f"{name} is overloaded")
+        self.name = name
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+class CircuitOpenError(OverloadedError):
+    """Raised while a circuit breaker is open"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(name, retry_after, f"{name} is unavailable (circuit open)")
+
+
+class AdaptiveLimiter:
+    """Bounded concurrency pool whose limit adapts to observed latency (AIMD).
+
+    Calls finishing under the latency target grow the limit additively
+    (+1/limit per call, i.e. about +1 per window); slow or failed calls shrink
+    it multiplicatively by `backoff`. When the pool is full, callers wait
+    at most `queue_timeout` seconds before being shed with OverloadedError.
+
+    With `latency_target=None` the target is relative instead: a call is slow
+    when it takes more than `latency_tolerance` times the moving average of
+    recent latencies (weight `smoothing`), so dependencies whose normal
+    latency is long or hard to predict are not throttled by healthy traffic.
+    Averages are kept per `kind` of call (e.g. full completion vs. time to
+    first byte of a stream).
+    """
+
+    def __init__(self, name, initial_limit=10, min_limit=1, max_limit=50,
+                 latency_target=1.0, backoff=0.9, queue_timeout=0.05, retry_after=1,
+                 latency_tolerance=2.0, smoothing=0.1):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baselines = {}
+        self.backoff = backoff
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.shed = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Take a slot or raise OverloadedError after queue_timeout"""
+        deadline = time.monotonic() + self.queue_timeout
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.shed += 1
+                    raise OverloadedError(self.name, self.retry_after)
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+    def release(self, latency=None, failed=False, kind=None):
+        """Return a slot; adjust the limit unless latency is None"""
+        with self._condition:
+            self.in_flight -= 1
+            if failed or (latency is not None and self._is_slow(latency, kind)):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            elif latency is not None:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify()
+
+    def _is_slow(self, latency, kind=None):
+        """Compare against the fixed target, or the kind's latency baseline (updated here)"""
+        if self.latency_target is not None:
+            return latency > self.latency_target
+        baseline = self.baselines.get(kind)
+        if baseline is None:
+            self.baselines[kind] = latency
+            return False
+        self.baselines[kind] = baseline + self.smoothing * (latency - baseline)
+        return latency > baseline * self.latency_tolerance
+
+    @contextmanager
+    def slot(self, track_latency=True, kind=None):
+        """Hold a slot for the duration of the block"""
+        self.acquire()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(time.monotonic() - started if track_latency else None, failed and track_latency, kind)
+
+    def stats(self):
+        stats = {
+            'limit': round(self.limit, 2),
+            'in_flight': self.in_flight,
+            'shed': self.shed
+        }
+        if self.baselines:
+            stats['latency_baselines'] = {
+                str(kind): round(baseline, 3) for kind, baseline in self.baselines.items()
+            }
+        return stats
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and fails fast until reset_timeout passes"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self):
+        return self.state == self.CLOSED
+
+    def allow_request(self):
+        """Raise CircuitOpenError if a call would be refused now.
+        
+        Read-only pre-check: unlike before_call it does not take the
+        half-open trial, so it is safe when the call itself goes through guard().
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                return
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                return
+            raise CircuitOpenError(self.name, max(1, self.reset_timeout - elapsed))
+
+    def before_call(self):
+        """Raise CircuitOpenError unless the call may proceed"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            # Half-open lets exactly one trial call through
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.name, max(1, self.reset_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self.failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @contextmanager
+    def guard(self):
+        """Run the block through the breaker, recording its outcome"""
+        self.before_call()
+        try:
+            yield
+        except (OverloadedError, GeneratorExit):
+            # Local load shedding or an abandoned stream says nothing about
+            # the dependency's health
+            with self._lock:
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+
+    def stats(self):
+        return {'state': self.state, 'failures': self.failures}
+
+
+# Process-wide registries: each dependency gets one shared pool / breaker
+_bulkheads = {}
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def bulkhead(name, **settings):
+    """Shared AdaptiveLimiter for a dependency (settings apply on first use)"""
+    with _registry_lock:
+        if name not in _bulkheads:
+            _bulkheads[name] = AdaptiveLimiter(name, **settings)
+        return _bulkheads[name]
+
+
+def circuit_breaker(name, **settings):
+    """Shared CircuitBreaker for a dependency (settings apply on first use)"""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **settings)
+        return _breakers[name]
+
+
+def dependency_stats():
+    """Current state of every bulkhead and circuit breaker"""
+    return {
+        'bulkheads': {name: limiter.stats() for name, limiter in _bulkheads.items()},
+        'circuit_breakers': {name: breaker.stats() for name, breaker in _breakers.items()}
+    }
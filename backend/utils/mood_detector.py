@@ -1,4 +1,3 @@
-from textblob import TextBlob
 import re
 import logging
 
@@ -19,6 +18,11 @@ class MoodDetector:
         'energetic': ['энергичн', 'активн', 'бодр', 'живой']
     }
     
+    def warm_up(self):
+        """Import the sentiment analyzer ahead of the first fallback"""
+        from textblob import TextBlob
+        TextBlob('').sentiment
+    
     def detect_mood(self, text):
         """Detect mood from text"""
         text_lower = text.lower()
@@ -36,6 +40,7 @@ class MoodDetector:
         else:
             # Fallback to sentiment analysis
             try:
+                from textblob import TextBlob
                 blob = TextBlob(text)
                 polarity = blob.sentiment.polarity
                 
@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import tracemalloc
+import logging
+from collections import Counter
+from datetime import datetime
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+# Route name currently served by each worker thread (thread ident -> endpoint)
+_active_routes = {}
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling session is already running"""
+
+
+def mark_request(endpoint):
+    """Attribute samples from the current thread to a Flask route"""
+    _active_routes[threading.get_ident()] = endpoint or 'unknown'
+
+
+def clear_request(*_):
+    """Stop attributing samples from the current thread to a route"""
+    _active_routes.pop(threading.get_ident(), None)
+
+
+class ProfileResult:
+    """Aggregated stack samples and optional allocation diff"""
+
+    def __init__(self, stacks, interval, duration, allocations=None):
+        self.stacks = stacks
+        self.interval = interval
+        self.duration = duration
+        self.allocations = allocations
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def to_collapsed(self):
+        """Brendan Gregg collapsed stacks (flamegraph.pl / speedscope input)"""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def to_speedscope(self, name='okko-backend'):
+        """Speedscope file format with one sampled profile"""
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+
+        for stack, count in self.stacks.most_common():
+            sample = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({'name': frame})
+                sample.append(frame_index[frame])
+            samples.append(sample)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            }],
+            'exporter': 'okko-backend-profiler',
+            'name': name
+        }
+
+
+class SamplingProfiler:
+    """Low-overhead wall-clock stack sampler for a running worker"""
+
+    def __init__(self, interval=0.005, max_seconds=60):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self.last_result = None
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    def start(self, seconds, track_allocations=False, output_dir=None):
+        """Run a profiling window in a background thread.
+
+        The calling request returns immediately, so the window also covers
+        requests served afterwards by single-threaded (sync) workers. The
+        result is kept in `last_result` and written to output_dir if given.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError('Profiler is already running')
+
+        def _background():
+            try:
+                self.last_result = self._run(seconds, track_allocations)
+                self.last_error = None
+                if output_dir:
+                    write_profile(self.last_result, output_dir)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Profiler error: {e}")
+
+        threading.Thread(target=_background, name='profiler', daemon=True).start()
+
+    def _run(self, seconds, track_allocations=False, top_allocations=25):
+        """Sample all request threads for `seconds` and return a ProfileResult.
+
+        The caller holds self._lock; it is released here.
+        """
+        try:
+            seconds = max(0.1, min(float(seconds), self.max_seconds))
+            started_tracing = False
+            baseline = None
+
+            if track_allocations:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(25)
+                    started_tracing = True
+                baseline = tracemalloc.take_snapshot()
+
+            started = time.monotonic()
+            stacks = self._sample(seconds)
+            duration = time.monotonic() - started
+
+            allocations = None
+            if track_allocations:
+                snapshot = tracemalloc.take_snapshot()
+                allocations = self._allocation_diff(baseline, snapshot, top_allocations)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            logger.info(f"Profiled {sum(stacks.values())} samples over {duration:.1f}s")
+            return ProfileResult(stacks, self.interval, duration, allocations)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds):
+        """Collect collapsed stacks from every thread except the caller"""
+        stacks = Counter()
+        own_thread = threading.get_ident()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                route = _active_routes.get(thread_id)
+                if route is None:
+                    continue
+                stacks[(route, *self._collapse(frame))] += 1
+            time.sleep(self.interval)
+
+        return stacks
+
+    @staticmethod
+    def _collapse(frame):
+        """Root-first frame names for a thread's current stack"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get('__name__', os.path.basename(code.co_filename))
+            names.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        names.reverse()
+        return names
+
+    @staticmethod
+    def _allocation_diff(baseline, snapshot, top):
+        """Top allocation growth between two tracemalloc snapshots"""
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        baseline = baseline.filter_traces(filters)
+        snapshot = snapshot.filter_traces(filters)
+
+        return [
+            {
+                'file': stat.traceback[0].filename,
+                'line': stat.traceback[0].lineno,
+                'size_diff': stat.size_diff,
+                'size': stat.size,
+                'count_diff': stat.count_diff,
+            }
+            for stat in snapshot.compare_to(baseline, 'lineno')[:top]
+        ]
+
+
+def write_profile(result, output_dir):
+    """Write collapsed stacks, speedscope JSON and allocations to output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = os.path.join(output_dir, f"profile-{os.getpid()}-{datetime.now():%Y%m%d-%H%M%S}")
+
+    with open(f"{prefix}.collapsed", 'w') as f:
+        f.write(result.to_collapsed())
+    with open(f"{prefix}.speedscope.json", 'w') as f:
+        json.dump(result.to_speedscope(), f)
+    if result.allocations is not None:
+        with open(f"{prefix}.allocations.json", 'w') as f:
+            json.dump(result.allocations, f, indent=2)
+
+    logger.info(f"Profile written to {prefix}.*")
+    return prefix
+
+
+def init_profiler(app):
+    """Attach route attribution hooks and the optional signal trigger to a Flask app"""
+    profiler = SamplingProfiler(
+        interval=app.config.get('PROFILER_INTERVAL', 0.005),
+        max_seconds=app.config.get('PROFILER_MAX_SECONDS', 60)
+    )
+
+    @app.before_request
+    def _mark_profiled_route():
+        mark_request(request.endpoint)
+
+    app.teardown_request(clear_request)
+
+    signal_name = app.config.get('PROFILER_SIGNAL')
+    if signal_name and hasattr(signal, signal_name):
+        seconds = app.config.get('PROFILER_SIGNAL_SECONDS', 30)
+        output_dir = app.config.get('PROFILER_OUTPUT_DIR', 'data/profiles')
+        track_allocations = app.config.get('PROFILER_SIGNAL_ALLOCATIONS', False)
+
+        def _handle_signal(signum, frame):
+            try:
+                profiler.start(seconds, track_allocations, output_dir)
+            except ProfilerBusyError:
+                logger.warning("Profiler signal ignored: profiler already running")
+
+        try:
+            signal.signal(getattr(signal, signal_name), _handle_signal)
+        except ValueError:
+            # Signal handlers can only be installed from the main thread
+            logger.warning(f"Profiler signal {signal_name} not installed outside main thread")
+
+    app.extensions['profiler'] = profiler
+    return profiler
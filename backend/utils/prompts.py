@@ -19,6 +19,8 @@ class PromptTemplates:
 - Учитывай указанное настроение и контекст
 - Если информации недостаточно - задай 1-2 уточняющих вопроса"""
 
+    DEGRADED_RESPONSE = """Сейчас я не могу ответить подробно, но вот подборка, которая подходит под ваш запрос и время суток."""
+
     @staticmethod
     def create_recommendation_prompt(user_query, context, mood_info):
         """Create recommendation prompt with context"""
@@ -0,0 +1,149 @@
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    Nothing is cached: once the in-flight call finishes, the next call with
+    the same key runs again.
+    """
+
+    def __init__(self, name='single-flight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs), or wait for the identical call already running"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"{self.name}: {call.waiters} callers shared one execution")
+            call.event.set()
+
+
+class _SharedStream:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.cancelled = False
+
+
+class StreamFanout:
+    """Shares one upstream iterator among concurrent consumers.
+
+    The first subscriber for a key starts a pump thread that drains the
+    upstream; every subscriber (including late joiners) replays all chunks
+    from the start and then follows the live stream. When the last
+    subscriber goes away, the pump stops and closes the upstream.
+    """
+
+    def __init__(self, name='stream-fanout'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._streams = {}
+
+    def subscribe(self, key, factory):
+        """Iterate the stream for key, starting factory() if none is in flight"""
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _SharedStream()
+                threading.Thread(
+                    target=self._pump, args=(key, stream, factory),
+                    name=self.name, daemon=True
+                ).start()
+            stream.subscribers += 1
+        return self._consume(key, stream)
+
+    def _pump(self, key, stream, factory):
+        upstream = None
+        try:
+            upstream = factory()
+            for chunk in upstream:
+                if stream.cancelled:
+                    logger.debug(f"{self.name}: all subscribers left, stopping upstream")
+                    break
+                with stream.condition:
+                    stream.chunks.append(chunk)
+                    stream.condition.notify_all()
+        except Exception as e:
+            stream.error = e
+        finally:
+            # Closing a generator upstream runs its cleanup (e.g. frees its bulkhead slot)
+            close = getattr(upstream, 'close', None)
+            if close is not None:
+                close()
+            with self._lock:
+                if self._streams.get(key) is stream:
+                    del self._streams[key]
+            with stream.condition:
+                stream.done = True
+                stream.condition.notify_all()
+
+    def _unsubscribe(self, key, stream):
+        with self._lock:
+            stream.subscribers -= 1
+            if stream.subscribers > 0:
+                return
+            # New subscribers must not join a stream that is being cancelled
+            if self._streams.get(key) is stream:
+                del self._streams[key]
+        stream.cancelled = True
+
+    def _consume(self, key, stream):
+        index = 0
+        try:
+            while True:
+                with stream.condition:
+                    while index >= len(stream.chunks) and not stream.done:
+                        stream.condition.wait()
+                    chunks = stream.chunks[index:]
+                    finished = stream.done
+                for chunk in chunks:
+                    yield chunk
+                index += len(chunks)
+                if finished and index >= len(stream.chunks):
+                    if stream.error is not None:
+                        raise stream.error
+                    return
+        finally:
+            self._unsubscribe(key, stream)
@@ -0,0 +1,23 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def http():
+    return create_app(warm_up=False).test_client()
+
+
+@pytest.mark.parametrize('body', [
+    ['not', 'an', 'object'],
+    {'requests': ['хочу комедию']},
+    {'requests': [{'query': 'x'}], 'limit': 'ten'},
+    {'requests': [{'query': 'x'}], 'limit': -5},
+    {'requests': [{'query': 'x', 'limit': 0}]},
+    {'requests': [{'query': 'x', 'limit': True}]},
+    {'requests': [{'query': 42}]},
+])
+def test_batch_rejects_invalid_requests_before_streaming(http, body):
+    response = http.post('/api/recommendations/batch', json=body)
+    assert response.status_code == 400
+    assert response.json['success'] is False
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import create_app
+from config import Config
+from routes import api as api_routes
+from services.context_service import ContextService
+from services.profile_service import ProfileStore
+from utils.concurrency import OverloadedError
+
+
+class FakeEngine:
+    def __init__(self):
+        self.shed = True
+
+    def generate_recommendations(self, query, context=None, limit=10, profile=None):
+        if self.shed:
+            raise OverloadedError('db', retry_after=2)
+        from models.title import ScoredTitles
+        return ScoredTitles.empty()
+
+
+@pytest.fixture
+def client():
+    app = create_app(warm_up=False)
+    engine = FakeEngine()
+    app.extensions['services'] = SimpleNamespace(
+        context_service=ContextService(Config()),
+        mood_detector=SimpleNamespace(detect_mood=lambda text: {'mood': 'happy'}),
+        profile_store=ProfileStore(Config()),
+        recommendation_engine=engine,
+        llm_service=SimpleNamespace(create_chat_completion=lambda *args, **kwargs: 'ответ')
+    )
+    api_routes.conversation_history.clear()
+    return app, app.test_client(), engine
+
+
+def test_shed_chat_leaves_history_and_profile_untouched(client):
+    app, http, engine = client
+    body = {'message': 'хочу комедию', 'session_id': 's1'}
+
+    response = http.post('/api/chat', json=body)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '2'
+    assert api_routes.conversation_history.get('s1', []) == []
+    assert app.extensions['services'].profile_store.get('s1') is None
+
+    engine.shed = False
+    response = http.post('/api/chat', json=body)
+    assert response.status_code == 200
+    assert [turn['role'] for turn in api_routes.conversation_history['s1']] == ['user', 'assistant']
+    assert list(app.extensions['services'].profile_store.get('s1').moods) == ['happy']
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+
+from services import catalog_export
+from services.catalog_export import iter_arrow_stream
+
+pa = pytest.importorskip('pyarrow')
+
+
+def _row(title_id, age_rating=None, genres=()):
+    return (title_id, 'Title', 'movie', age_rating, date(2020, 1, 1),
+            None, None, list(genres), [], [], None)
+
+
+def test_arrow_schema_is_fixed_across_batches():
+    # age_rating and genres are all NULL/empty in the first batch only
+    rows = [_row(1), _row(2), _row(3, age_rating=16, genres=['драма'])]
+
+    data = b''.join(iter_arrow_stream(rows, batch_size=2))
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.schema.field('age_rating').type == pa.int64()
+    assert table.column('age_rating').to_pylist() == [None, None, 16]
+    assert table.column('genres').to_pylist() == [[], [], ['драма']]
+
+
+@pytest.fixture
+def admin_client():
+    from app import create_app
+
+    app = create_app(warm_up=False)
+    app.config['ADMIN_TOKEN'] = 'token'
+    return app.test_client()
+
+
+@pytest.mark.parametrize('query', ['itersize=0', 'batch_size=-1'])
+def test_export_rejects_non_positive_sizes(admin_client, query):
+    response = admin_client.get(f'/api/admin/catalog/export?{query}', headers={'X-Admin-Token': 'token'})
+    assert response.status_code == 400
+
+
+def test_arrow_export_without_pyarrow_fails_before_streaming(admin_client, monkeypatch):
+    def missing():
+        raise RuntimeError('Arrow/Parquet export requires pyarrow')
+
+    monkeypatch.setattr(catalog_export, 'require_pyarrow', missing)
+    response = admin_client.get('/api/admin/catalog/export?format=arrow', headers={'X-Admin-Token': 'token'})
+    assert response.status_code == 501
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+from utils.concurrency import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, OverloadedError
+
+
+def _open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=reset_timeout)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            with breaker.guard():
+                raise RuntimeError('down')
+    return breaker
+
+
+def test_circuit_opens_after_threshold_and_fails_fast():
+    breaker = _open_breaker(reset_timeout=30)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.allow_request()
+    assert info.value.retry_after >= 1
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+
+
+def test_half_open_allows_one_trial_and_success_closes():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_half_open_failure_reopens():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError('still down')
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_allow_request_does_not_take_the_trial():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+
+    breaker.allow_request()
+    breaker.allow_request()
+    with breaker.guard():
+        pass
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_shed_trial_does_not_jam_half_open():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+
+    with pytest.raises(OverloadedError):
+        with breaker.guard():
+            raise OverloadedError('llm')
+    with breaker.guard():
+        pass
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_limiter_grows_on_fast_calls():
+    limiter = AdaptiveLimiter('test', initial_limit=2, max_limit=3, latency_target=1.0)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(latency=0.01)
+    assert limiter.limit == 3
+
+
+def test_limiter_shrinks_on_slow_or_failed_calls():
+    limiter = AdaptiveLimiter('test', initial_limit=10, min_limit=2, latency_target=0.1, backoff=0.5)
+    limiter.acquire()
+    limiter.release(latency=1.0)
+    assert limiter.limit == 5
+    limiter.acquire()
+    limiter.release(failed=True)
+    assert limiter.limit == 2.5
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(failed=True)
+    assert limiter.limit == 2
+
+
+def test_limiter_sheds_when_full():
+    limiter = AdaptiveLimiter('test', initial_limit=1, queue_timeout=0.01, retry_after=3)
+    limiter.acquire()
+    with pytest.raises(OverloadedError) as info:
+        limiter.acquire()
+    assert info.value.retry_after == 3
+    assert limiter.shed == 1
+
+    limiter.release()
+    limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+def test_relative_target_keeps_limit_under_steady_slow_latency():
+    limiter = AdaptiveLimiter('test', initial_limit=8, max_limit=16, latency_target=None)
+    for i in range(200):
+        limiter.acquire()
+        # Normal LLM completions: 12-18 s, well above any fixed 10 s target
+        limiter.release(latency=12.0 + (i % 7))
+    assert limiter.limit >= 8
+
+
+def test_relative_target_shrinks_on_slowdown():
+    limiter = AdaptiveLimiter('test', initial_limit=8, latency_target=None, backoff=0.5)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=1.0)
+    grown = limiter.limit
+
+    limiter.acquire()
+    limiter.release(latency=5.0)
+    assert limiter.limit < grown
+
+
+def test_relative_target_tracks_call_kinds_separately():
+    limiter = AdaptiveLimiter('test', initial_limit=8, latency_target=None)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=0.5, kind='first_byte')
+        limiter.acquire()
+        limiter.release(latency=15.0, kind='completion')
+    assert limiter.limit > 8
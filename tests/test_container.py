@@ -0,0 +1,77 @@
+import time
+from types import SimpleNamespace
+
+from services.container import ServiceContainer
+
+
+class FlakyEmbeddings:
+    """Embedding model stub whose loading fails a given number of times"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.is_loaded = False
+
+    @property
+    def model(self):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('model download failed')
+        self.is_loaded = True
+        return object()
+
+
+class FlakyContainer(ServiceContainer):
+    def __init__(self, config, failures):
+        super().__init__(config)
+        self.embeddings = FlakyEmbeddings(failures)
+
+    @property
+    def llm_service(self):
+        return self._get('llm_service', object)
+
+    @property
+    def context_service(self):
+        return self._get('context_service', object)
+
+    @property
+    def mood_detector(self):
+        return self._get('mood_detector', lambda: SimpleNamespace(warm_up=lambda: None))
+
+    @property
+    def recommendation_engine(self):
+        return self._get('recommendation_engine', lambda: SimpleNamespace(embeddings=self.embeddings))
+
+
+def _wait(container):
+    container._warmup_thread.join(2)
+
+
+def test_failed_warm_up_is_retried_after_backoff():
+    container = FlakyContainer({'WARMUP_RETRY_DELAY': 0.05, 'WARMUP_RETRY_MAX_DELAY': 1}, failures=1)
+
+    container.ensure_warm_up()
+    _wait(container)
+    status = container.readiness()
+    assert not status['ready']
+    assert 'model download failed' in status['error']
+
+    # Still backing off: no new attempt yet
+    first = container._warmup_thread
+    container.ensure_warm_up()
+    assert container._warmup_thread is first
+
+    time.sleep(0.06)
+    container.ensure_warm_up()
+    _wait(container)
+    status = container.readiness()
+    assert status['ready']
+    assert 'error' not in status
+
+
+def test_cli_app_does_not_start_warm_up():
+    from app import create_app
+
+    app = create_app()
+    services = app.extensions['services']
+    app.test_cli_runner().invoke(args=['export-catalog', '--help'])
+    assert services._warmup_thread is None
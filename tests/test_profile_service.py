@@ -0,0 +1,28 @@
+import pytest
+
+from models.title import GENRES
+from services.profile_service import ProfileStore
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('хочу ужасов на вечер', ['ужасы']),
+    ('это ужасно скучно', []),
+    ('спорный вопрос', []),
+    ('что-нибудь про спорт', ['спорт']),
+    ('комедию или мелодраму', ['комедия', 'мелодрама']),
+])
+def test_mentioned_genres_match_whole_words(message, expected):
+    for name in ('ужасы', 'спорт', 'комедия', 'мелодрама', 'драма'):
+        GENRES.bit(name)
+    assert GENRES.names(ProfileStore._mentioned_genres(message)) == expected
+
+
+def test_fold_starts_over_after_ttl():
+    store = ProfileStore({'PROFILE_TTL': 60})
+    profile = store.save('s1', store.fold('s1', 'хочу комедию', 'happy'))
+    assert list(store.fold('s1', 'ещё', 'sad').moods) == ['happy', 'sad']
+
+    profile.updated_at -= 61
+    folded = store.fold('s1', 'ещё', 'sad')
+    assert list(folded.moods) == ['sad']
+    assert store.get('s1') is None
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, StreamFanout
+
+
+def _start(target, count):
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_single_flight_shares_leader_result():
+    flights = SingleFlight('test')
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        return 'value'
+
+    threads, results = _start(lambda: flights.do('key', fn), 5)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+
+
+def test_single_flight_propagates_exception_to_waiters():
+    flights = SingleFlight('test')
+    release = threading.Event()
+
+    def fn():
+        release.wait(2)
+        raise ValueError('boom')
+
+    threads, results = _start(lambda: flights.do('key', fn), 3)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_single_flight_runs_again_after_completion():
+    flights = SingleFlight('test')
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert flights.do('key', fn) == 1
+    assert flights.do('key', fn) == 2
+
+
+def test_stream_fanout_late_joiner_replays_from_start():
+    fanout = StreamFanout('test')
+    second_chunk = threading.Event()
+    starts = []
+
+    def factory():
+        starts.append(1)
+        yield 'a'
+        second_chunk.wait(2)
+        yield 'b'
+
+    first = fanout.subscribe('key', factory)
+    assert next(first) == 'a'
+
+    late = fanout.subscribe('key', factory)
+    second_chunk.set()
+
+    assert list(first) == ['b']
+    assert list(late) == ['a', 'b']
+    assert len(starts) == 1
+
+
+def test_stream_fanout_propagates_upstream_error():
+    fanout = StreamFanout('test')
+
+    def factory():
+        yield 'a'
+        raise ValueError('boom')
+
+    stream = fanout.subscribe('key', factory)
+    assert next(stream) == 'a'
+    with pytest.raises(ValueError):
+        list(stream)
+
+
+def test_stream_fanout_stops_upstream_when_all_subscribers_leave():
+    fanout = StreamFanout('test')
+    closed = threading.Event()
+    produced = []
+
+    def factory():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+                time.sleep(0.01)
+        finally:
+            closed.set()
+
+    first = fanout.subscribe('key', factory)
+    second = fanout.subscribe('key', factory)
+    next(first)
+    next(second)
+    first.close()
+    assert not closed.wait(0.1)
+
+    second.close()
+    assert closed.wait(2)
+    assert len(produced) < 1000
+
+    # A new subscriber starts a fresh upstream instead of joining the cancelled one
+    fresh = fanout.subscribe('key', factory)
+    assert next(fresh) == 0
+    fresh.close()